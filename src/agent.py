@@ -4,11 +4,14 @@ Main agent implementation using LiveKit and Gemini Multimodal Live API
 """
 
 import os
-import json
 import logging
 import asyncio
+import time
+from functools import cached_property
 from datetime import datetime
 from pathlib import Path
+from typing import Dict, Final, Optional, Tuple
+import orjson
 from dotenv import load_dotenv
 
 # Load environment variables
@@ -16,28 +19,116 @@ project_root = Path(__file__).parent.parent
 env_path = project_root / '.env'
 load_dotenv(env_path)
 
+from config import config
+
+# Validate required settings once at import and fail fast, rather than
+# discovering a missing key inside a job. The worker never uploads
+# recordings, so cloud storage settings aren't its concern
+config.validate(check_storage=False)
+
+GOOGLE_API_KEY: Final[str] = config.GOOGLE_API_KEY
+
 from livekit.agents import (
     Agent,
     AgentSession,
     JobContext,
+    JobProcess,
     WorkerOptions,
     cli,
     tokenize,
 )
-from livekit.plugins import google
 from livekit import rtc
+# Plugins must register on the main thread, so import at module level
+# rather than inside prewarm or a job (which may run on a worker thread)
+from livekit.plugins import google
 
-from prompts import get_interview_prompt
+from io_executor import run_io
+from timestamps import file_timestamp
+from prompts import get_interview_prompt, list_available_roles
 from local_recording_manager import LocalRecordingManager
-from transcription_handler import TranscriptionHandler
+from transcription_handler import FLUSH_BATCH_SIZE, FLUSH_INTERVAL, TranscriptionHandler
 
-# Configure logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
-)
+# Configure logging (only once, even if this module is imported again)
+_root_logger = logging.getLogger()
+if not _root_logger.handlers:
+    _handler = logging.StreamHandler()
+    _handler.setFormatter(
+        logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+    )
+    _root_logger.addHandler(_handler)
+    _root_logger.setLevel(logging.INFO)
 logger = logging.getLogger(__name__)
 
+def _install_uvloop():
+    """Use uvloop for the event loop when USE_UVLOOP=1 and it's installed"""
+    if not config.USE_UVLOOP:
+        return
+    try:
+        import uvloop
+    except ImportError:
+        logger.warning("USE_UVLOOP=1 but uvloop is not installed, using default event loop")
+        return
+    # Note: profilers will show libuv frames instead of selector frames
+    asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+    logger.info("uvloop event loop policy installed")
+
+
+# Runs at import so job processes (which re-import this module) get it too
+_install_uvloop()
+
+# Transcript batching: turns are queued by the session event handlers and
+# flushed to disk by a single background task, using the batch size and
+# interval shared with TranscriptionHandler
+TRANSCRIPT_QUEUE_SIZE = 1024
+
+# Speaker labels used in transcripts
+AI_SPEAKER = "AI_Interviewer"
+CANDIDATE_SPEAKER = "Candidate"
+
+# Scripted opening line, built once per process
+GREETING = "Hi! I'm your AI interviewer. How are you doing today?"
+GREETING_INSTRUCTIONS = f'Greet the candidate by saying exactly: "{GREETING}"'
+
+# Upper bound (seconds) for each cleanup step at the end of a session
+CLEANUP_STEP_TIMEOUT = 5.0
+
+# How long (seconds) a candidate who left has to rejoin (e.g. a page reload)
+# before the interview is ended
+CANDIDATE_REJOIN_GRACE = 20.0
+
+# RealtimeModel instances are reused per role for this long (seconds)
+REALTIME_MODEL_TTL = 55 * 60
+_realtime_models: Dict[str, Tuple[float, object]] = {}
+
+
+def _get_realtime_model(job_role: str, instructions: str):
+    """Get a RealtimeModel for this role, reusing a recent one if available"""
+    now = time.monotonic()
+    cached = _realtime_models.get(job_role)
+    if cached and now - cached[0] < REALTIME_MODEL_TTL:
+        return cached[1]
+
+    # Using gemini-2.5-flash-native-audio-latest which is verified to work!
+    logger.info("Initializing RealtimeModel (Gemini 2.5 Flash Native Audio)...")
+    model = google.realtime.RealtimeModel(
+        model="gemini-2.5-flash-native-audio-latest",
+        api_version="v1beta",
+        api_key=GOOGLE_API_KEY,
+        instructions=instructions,
+        voice="Puck",
+    )
+    _realtime_models[job_role] = (now, model)
+    return model
+
+
+TRANSCRIPTS_DIR = "transcripts"
+
+
+def _open_transcript(path: str):
+    """Open the running transcript file, line-buffered (run via run_io)"""
+    return open(path, "w", buffering=1)
+
+
 class InterviewAgent:
     """Main interview agent class using Gemini Multimodal Live"""
     
@@ -51,8 +142,28 @@ class InterviewAgent:
         self.job_role = job_role
         self.interview_duration = interview_duration
         self.start_time = None
+        self._start_monotonic: Optional[float] = None
         self.recorder = None
         self.transcription = None
+        self._transcript_q: asyncio.Queue = asyncio.Queue(maxsize=TRANSCRIPT_QUEUE_SIZE)
+        self._transcript_drops = 0
+        self._flusher: Optional[asyncio.Task] = None
+        self._transcript_fp = None
+        self._end_event = asyncio.Event()
+        self._greeting = None
+        # LiveKit identity of the candidate, recorded when they join (room
+        # metadata's candidate_id isn't tied to it)
+        self._candidate_identity: Optional[str] = None
+        self._room_disconnected = False
+        # Pending end-of-interview after the candidate left, and the identity
+        # whose return cancels it (None: anyone rejoining the empty room)
+        self._rejoin_timer: Optional[asyncio.TimerHandle] = None
+        self._rejoin_identity: Optional[str] = None
+
+    @cached_property
+    def transcript_path(self) -> str:
+        """Path of the readable transcript for this interview"""
+        return os.path.join(TRANSCRIPTS_DIR, f"{self.candidate_id}_transcript.txt")
 
     async def start_interview(self, ctx: JobContext):
         """Start the interview session"""
@@ -60,64 +171,90 @@ class InterviewAgent:
         
         try:
             # 1. Initialize components
-            api_key = os.getenv("GOOGLE_API_KEY")
             interview_instructions = get_interview_prompt(self.job_role)
-            
-            # Using gemini-2.5-flash-native-audio-latest which is verified to work!
-            logger.info("Initializing RealtimeModel (Gemini 2.5 Flash Native Audio)...")
-            model = google.realtime.RealtimeModel(
-                model="gemini-2.5-flash-native-audio-latest",
-                api_version="v1beta",
-                api_key=api_key,
-                instructions=interview_instructions,
-                voice="Puck",
+            logger.debug(
+                "Using cached instructions for role %s (id=%s)",
+                self.job_role, id(interview_instructions)
             )
+            
+            model = _get_realtime_model(self.job_role, interview_instructions)
 
             # Create the modern Agent holding the model
             logger.info("Initializing Agent and AgentSession...")
             self.agent = Agent(llm=model, instructions=interview_instructions)
-            self.session = AgentSession()
+            # Start generating as soon as the user's turn looks final so model
+            # prefill overlaps end-of-turn detection
+            self.session = AgentSession(preemptive_generation=True)
             
             # 2. Setup Recording & Transcription
-            self.recorder = LocalRecordingManager()
+            # (constructor touches the filesystem, keep it off the event loop)
+            self.recorder = await run_io(LocalRecordingManager)
             self.transcription = TranscriptionHandler(
-                interview_id=f"{self.candidate_id}_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
+                interview_id=f"{self.candidate_id}_{file_timestamp()}"
             )
+            # The readable transcript is appended as turns arrive, so it's
+            # durable mid-session and there is no big write at shutdown
+            self._transcript_fp = await run_io(_open_transcript, self.transcript_path)
+            self._flusher = asyncio.create_task(self._drain_transcripts())
 
             # 3. Add Event Handlers for Transcription (Robustness)
             @self.session.on("user_input_transcribed")
             def _on_user_transcript(ev):
                 if ev.transcript:
-                    logger.info(f"--- USER: {ev.transcript} ---")
+                    if logger.isEnabledFor(logging.DEBUG):
+                        logger.debug("--- USER: %s ---", ev.transcript)
+                    if ev.is_final:
+                        self._queue_transcript(CANDIDATE_SPEAKER, ev.transcript)
 
             @self.session.on("conversation_item_added")
             def _on_item_added(ev):
-                # ev.item is a ChatMessage
-                if ev.item.role == "assistant" and ev.item.text_content:
-                    logger.info(f"--- BOT: {ev.item.text_content} ---")
-                    if self.transcription:
-                        asyncio.create_task(self.transcription.on_transcript(
-                            type('Event', (), {'participant': type('P', (), {'identity': 'AI_Interviewer'})(), 'text': ev.item.text_content, 'is_final': True})
-                        ))
+                # ev.item is a ChatMessage; text_content joins its parts on
+                # every access, so read it once
+                if ev.item.role != "assistant":
+                    return
+                text = ev.item.text_content
+                if text:
+                    if logger.isEnabledFor(logging.DEBUG):
+                        logger.debug("--- BOT: %s ---", text)
+                    self._queue_transcript(AI_SPEAKER, text)
 
             # 4. Connect and Start
             await ctx.connect()
             logger.info(f"Connected to room: {ctx.room.name}")
 
+            # The first participant to join is the candidate
+            try:
+                candidate = await asyncio.wait_for(
+                    ctx.wait_for_participant(), timeout=self.interview_duration * 60
+                )
+            except asyncio.TimeoutError:
+                logger.info("No candidate joined before the time limit.")
+                await ctx.room.disconnect()
+                return
+            self._candidate_identity = candidate.identity
+            logger.info(f"Candidate joined: {candidate.identity}")
+
             # Start the session (Modern API requires the agent)
             # Setting record=False to avoid 401 errors in LiveKit Cloud
             # Local recording manager still handles candidate data
             await self.session.start(self.agent, room=ctx.room, record=False)
             self.start_time = datetime.now()
+            # Elapsed time is measured on the loop's monotonic clock
+            self._start_monotonic = asyncio.get_running_loop().time()
             logger.info("AgentSession started")
 
             # Greet the candidate using the RealtimeModel's native generation
-            # Since .say() requires a TTS, we push a message to history and generate
-            self.session.history.add_message(
-                role="assistant",
-                content="Hi! I'm your AI interviewer. How are you doing today?"
+            # (.say() requires a TTS, so the scripted line goes in as a directive)
+            self._greeting = self.session.generate_reply(instructions=GREETING_INSTRUCTIONS)
+
+            # End the interview when the candidate leaves (after a grace period
+            # to rejoin) instead of waiting out the time limit
+            ctx.room.on(
+                "participant_disconnected",
+                lambda participant: self._on_participant_left(ctx.room, participant)
             )
-            self.session.generate_reply()
+            ctx.room.on("participant_connected", self._on_participant_joined)
+            ctx.room.on("disconnected", self._on_room_disconnected)
 
             # 5. Monitor
             await self._monitor_interview_duration(ctx)
@@ -128,40 +265,187 @@ class InterviewAgent:
         finally:
             # CLEANUP: Ensure recordings and transcripts are saved
             logger.info("Multimodal session cleanup starting...")
-            if self.recorder:
-                try:
-                    info = self.recorder.stop_recording()
-                    logger.info(f"Recording stopped: {info}")
-                except: pass
-            
-            if self.transcription:
-                try:
-                    transcript_text = self.transcription.get_full_transcript()
-                    os.makedirs("transcripts", exist_ok=True)
-                    path = f"transcripts/{self.candidate_id}_transcript.txt"
-                    with open(path, "w") as f:
-                        f.write(transcript_text)
-                    logger.info(f"Final transcript saved to {path}")
-                except: pass
-            
+            # Recording and transcript shutdown are independent, run them together
+            await asyncio.gather(self._stop_recording(), self._finalize_transcript())
             logger.info("Cleanup complete.")
 
-    async def _monitor_interview_duration(self, ctx: JobContext):
-        max_duration_seconds = self.interview_duration * 60
-        while True:
-            await asyncio.sleep(60)
-            if self.start_time:
-                elapsed = (datetime.now() - self.start_time).total_seconds()
-                if elapsed >= max_duration_seconds:
-                    logger.info("Interview limit reached.")
-                    await ctx.room.disconnect()
+    def _interrupt_greeting(self):
+        if self._greeting and not self._greeting.done():
+            logger.info("Candidate left before greeting finished, interrupting")
+            self._greeting.interrupt()
+
+    def _on_participant_left(self, room: rtc.Room, participant: rtc.RemoteParticipant):
+        """Schedule the end of the interview if the candidate left"""
+        candidate_left = participant.identity == self._candidate_identity
+        if not candidate_left and room.remote_participants:
+            # Someone else (e.g. an observer) left; the candidate may still be here
+            return
+        self._interrupt_greeting()
+        if self._rejoin_timer is None:
+            logger.info(
+                "Candidate left, ending interview in %.0fs unless they rejoin",
+                CANDIDATE_REJOIN_GRACE
+            )
+            self._rejoin_identity = participant.identity if candidate_left else None
+            self._rejoin_timer = asyncio.get_running_loop().call_later(
+                CANDIDATE_REJOIN_GRACE, self._end_event.set
+            )
+
+    def _on_participant_joined(self, participant: rtc.RemoteParticipant):
+        """Cancel a pending end of the interview when the candidate rejoins"""
+        if self._rejoin_timer is None:
+            return
+        if self._rejoin_identity in (None, participant.identity):
+            self._rejoin_timer.cancel()
+            self._rejoin_timer = None
+            logger.info(f"Candidate rejoined: {participant.identity}")
+
+    def _on_room_disconnected(self, *_):
+        """The agent lost the room, so the interview can't continue"""
+        self._room_disconnected = True
+        self._interrupt_greeting()
+        self._end_event.set()
+
+    async def _stop_recording(self):
+        """Stop the recorder (bounded so a hung recorder can't hold the job slot)"""
+        if not self.recorder:
+            return
+        try:
+            info = await asyncio.wait_for(
+                run_io(self.recorder.stop_recording),
+                timeout=CLEANUP_STEP_TIMEOUT
+            )
+            logger.info(f"Recording stopped: {info}")
+        except Exception:
+            logger.exception("Failed to stop recording")
+
+    async def _finalize_transcript(self):
+        """Flush queued transcript lines, then close the transcript file"""
+        if self._flusher:
+            # Sentinel lets the flusher write out everything queued so far;
+            # wait_for cancels it (which still drains) if it takes too long
+            self._queue_transcript(None, None)
+            try:
+                await asyncio.wait_for(self._flusher, timeout=CLEANUP_STEP_TIMEOUT)
+            except Exception:
+                logger.exception("Failed to flush queued transcript lines")
+        
+        if self._transcript_fp:
+            try:
+                await asyncio.wait_for(
+                    run_io(self._transcript_fp.close),
+                    timeout=CLEANUP_STEP_TIMEOUT
+                )
+                logger.info(f"Final transcript saved to {self._transcript_fp.name}")
+            except Exception:
+                logger.exception("Failed to save final transcript")
+
+    def _queue_transcript(self, speaker: Optional[str], text: Optional[str]):
+        """Queue a transcript line for the background flusher (drops oldest when full)"""
+        try:
+            self._transcript_q.put_nowait((speaker, text))
+        except asyncio.QueueFull:
+            self._transcript_q.get_nowait()
+            self._transcript_q.put_nowait((speaker, text))
+            self._transcript_drops += 1
+            logger.warning("Transcript queue full, dropped %d line(s)", self._transcript_drops)
+
+    async def _drain_transcripts(self):
+        """Flush queued transcript lines every N turns or T seconds"""
+        loop = asyncio.get_running_loop()
+        batch = []
+        flush_at = 0.0
+        try:
+            while True:
+                # Idle until the first line arrives, then flush at most
+                # FLUSH_INTERVAL seconds after it
+                timeout = max(0.0, flush_at - loop.time()) if batch else None
+                try:
+                    speaker, text = await asyncio.wait_for(
+                        self._transcript_q.get(), timeout=timeout
+                    )
+                    if speaker is None:
+                        # Shutdown sentinel
+                        pending, batch = batch, []
+                        await self._flush_transcript_batch(pending)
+                        return
+                    if not batch:
+                        flush_at = loop.time() + FLUSH_INTERVAL
+                    batch.append(self.transcription.add_entry(speaker, text))
+                    if len(batch) < FLUSH_BATCH_SIZE:
+                        continue
+                except asyncio.TimeoutError:
+                    pass
+                # Hand the batch off before awaiting, so a cancellation during
+                # the write doesn't write the same lines again below
+                pending, batch = batch, []
+                await self._flush_transcript_batch(pending)
+        except asyncio.CancelledError:
+            # Write out lines not handed off yet and those still queued,
+            # bounded so a hung disk can't hold up shutdown
+            while not self._transcript_q.empty():
+                speaker, text = self._transcript_q.get_nowait()
+                if speaker is None:
                     break
+                batch.append(self.transcription.add_entry(speaker, text))
+            try:
+                await asyncio.wait_for(
+                    self._flush_transcript_batch(batch),
+                    timeout=CLEANUP_STEP_TIMEOUT
+                )
+            except asyncio.TimeoutError:
+                logger.warning("Timed out writing %d transcript line(s) on shutdown", len(batch))
+            raise
+
+    async def _flush_transcript_batch(self, batch: list):
+        """Append a batch to the JSONL log and the readable transcript"""
+        if not batch:
+            return
+        await self.transcription.save_transcript_chunks(batch)
+        lines = ''.join(
+            self.transcription.format_entry(entry) + '\n' for entry in batch
+        )
+        try:
+            await run_io(self._transcript_fp.write, lines)
+        except Exception:
+            logger.exception("Failed to append to transcript")
+
+    async def _monitor_interview_duration(self, ctx: JobContext):
+        # Single deadline on the loop's monotonic clock instead of polling;
+        # returns early as soon as the interview is ended another way
+        deadline = self.interview_duration * 60
+        try:
+            await asyncio.wait_for(self._end_event.wait(), timeout=deadline)
+        except asyncio.TimeoutError:
+            logger.info("Interview limit reached.")
+        else:
+            elapsed = asyncio.get_running_loop().time() - self._start_monotonic
+            logger.info("Interview ended before time limit after %.1f minutes.", elapsed / 60)
+        
+        # Returning from the entrypoint doesn't end the job; leaving the room
+        # does (unless the room already dropped the agent)
+        if not self._room_disconnected:
+            await ctx.room.disconnect()
+
+def prewarm(proc: JobProcess):
+    """Warm per-process caches once so jobs don't pay for them on start"""
+    # Create output directories once per process rather than per session
+    os.makedirs(TRANSCRIPTS_DIR, exist_ok=True)
+
+    # Fill the prompt cache for every role so each job reuses the same
+    # instruction strings instead of building them on the job's critical path
+    for role in list_available_roles():
+        get_interview_prompt(role)
+    logger.info(f"Worker process prewarmed (pid: {proc.pid})")
+
 
 async def entrypoint(ctx: JobContext):
     logger.info(f"JOB RECEIVED: {ctx.job.id}")
     
-    # Get metadata
-    room_metadata = json.loads(ctx.room.metadata) if ctx.room.metadata else {}
+    # Get metadata from the job's room info, which is available at dispatch
+    # time without waiting for the room connection to sync it
+    metadata = ctx.job.room.metadata or ctx.room.metadata
+    room_metadata = orjson.loads(metadata) if metadata else {}
     candidate_id = room_metadata.get("candidate_id", "unknown")
     job_role = room_metadata.get("job_role", "software_engineer")
     
@@ -172,5 +456,6 @@ if __name__ == "__main__":
     cli.run_app(
         WorkerOptions(
             entrypoint_fnc=entrypoint,
+            prewarm_fnc=prewarm,
         )
     )
\ No newline at end of file
@@ -5,7 +5,10 @@ Centralized configuration for the AI interview system
 
 import os
 from pathlib import Path
-from typing import Optional
+from dataclasses import dataclass
+from functools import lru_cache
+from types import MappingProxyType
+from typing import Mapping, Optional
 from dotenv import load_dotenv
 
 # Load environment variables from project root
@@ -17,47 +20,59 @@ load_dotenv(env_path)
 # Also try loading from current directory as fallback
 load_dotenv()
 
+# Read-only snapshot of the environment, taken once after .env is loaded.
+# All settings below are read from it instead of calling os.getenv
+_ENV = MappingProxyType(dict(os.environ))
 
+# Settings that must be non-empty for the agent to start
+_REQUIRED_FIELDS = ("GOOGLE_API_KEY", "LIVEKIT_URL", "LIVEKIT_API_KEY", "LIVEKIT_API_SECRET")
+
+
+@dataclass(frozen=True, slots=True)
 class Config:
-    """Application configuration"""
+    """
+    Application configuration
+    
+    Immutable, with settings stored in slots: read them and call validate()
+    / get_storage_config() through the module-level `config` instance, not
+    the class (Config.GOOGLE_API_KEY is a slot descriptor, not the value).
+    """
     
     # Google AI Configuration
-    GOOGLE_API_KEY: str = os.getenv("GOOGLE_API_KEY", "")
-    USE_VERTEX_AI: bool = os.getenv("USE_VERTEX_AI", "false").lower() == "true"
-    GOOGLE_CLOUD_PROJECT: Optional[str] = os.getenv("GOOGLE_CLOUD_PROJECT")
-    GOOGLE_CLOUD_LOCATION: str = os.getenv("GOOGLE_CLOUD_LOCATION", "us-central1")
+    GOOGLE_API_KEY: str = _ENV.get("GOOGLE_API_KEY", "")
+    USE_VERTEX_AI: bool = _ENV.get("USE_VERTEX_AI", "false").lower() == "true"
+    GOOGLE_CLOUD_PROJECT: Optional[str] = _ENV.get("GOOGLE_CLOUD_PROJECT")
+    GOOGLE_CLOUD_LOCATION: str = _ENV.get("GOOGLE_CLOUD_LOCATION", "us-central1")
     
-    print(GOOGLE_API_KEY)
     # LiveKit Configuration
-    LIVEKIT_URL: str = os.getenv("LIVEKIT_URL", "")
-    LIVEKIT_API_KEY: str = os.getenv("LIVEKIT_API_KEY", "")
-    LIVEKIT_API_SECRET: str = os.getenv("LIVEKIT_API_SECRET", "")
-
-    print(LIVEKIT_URL)
+    LIVEKIT_URL: str = _ENV.get("LIVEKIT_URL", "")
+    LIVEKIT_API_KEY: str = _ENV.get("LIVEKIT_API_KEY", "")
+    LIVEKIT_API_SECRET: str = _ENV.get("LIVEKIT_API_SECRET", "")
     
     # Recording Configuration
-    USE_CLOUD_STORAGE: bool = os.getenv("USE_CLOUD_STORAGE", "false").lower() == "true"
+    USE_CLOUD_STORAGE: bool = _ENV.get("USE_CLOUD_STORAGE", "false").lower() == "true"
     
     # AWS Configuration
-    AWS_ACCESS_KEY: str = os.getenv("AWS_ACCESS_KEY", "")
-    AWS_SECRET_KEY: str = os.getenv("AWS_SECRET_KEY", "")
-    AWS_REGION: str = os.getenv("AWS_REGION", "us-east-1")
-    AWS_BUCKET: str = os.getenv("AWS_BUCKET", "interview-recordings")
+    AWS_ACCESS_KEY: str = _ENV.get("AWS_ACCESS_KEY", "")
+    AWS_SECRET_KEY: str = _ENV.get("AWS_SECRET_KEY", "")
+    AWS_REGION: str = _ENV.get("AWS_REGION", "us-east-1")
+    AWS_BUCKET: str = _ENV.get("AWS_BUCKET", "interview-recordings")
     
     # GCS Configuration
-    GCS_BUCKET: Optional[str] = os.getenv("GCS_BUCKET")
-    GOOGLE_APPLICATION_CREDENTIALS: Optional[str] = os.getenv("GOOGLE_APPLICATION_CREDENTIALS")
+    GCS_BUCKET: Optional[str] = _ENV.get("GCS_BUCKET")
+    GOOGLE_APPLICATION_CREDENTIALS: Optional[str] = _ENV.get("GOOGLE_APPLICATION_CREDENTIALS")
     
     # Application Settings
-    INTERVIEW_DURATION_MINUTES: int = int(os.getenv("INTERVIEW_DURATION_MINUTES", "30"))
-    MAX_CONCURRENT_INTERVIEWS: int = int(os.getenv("MAX_CONCURRENT_INTERVIEWS", "5"))
-    LOG_LEVEL: str = os.getenv("LOG_LEVEL", "INFO")
+    INTERVIEW_DURATION_MINUTES: int = int(_ENV.get("INTERVIEW_DURATION_MINUTES", "30"))
+    MAX_CONCURRENT_INTERVIEWS: int = int(_ENV.get("MAX_CONCURRENT_INTERVIEWS", "5"))
+    LOG_LEVEL: str = _ENV.get("LOG_LEVEL", "INFO")
+    USE_UVLOOP: bool = _ENV.get("USE_UVLOOP", "0") == "1"
     
     # Database Configuration
-    DATABASE_URL: Optional[str] = os.getenv("DATABASE_URL")
+    DATABASE_URL: Optional[str] = _ENV.get("DATABASE_URL")
     
     # Monitoring
-    SENTRY_DSN: Optional[str] = os.getenv("SENTRY_DSN")
+    SENTRY_DSN: Optional[str] = _ENV.get("SENTRY_DSN")
     
     # Directories
     RECORDINGS_DIR: str = "recordings"
@@ -69,27 +84,23 @@ class Config:
     GEMINI_VOICE: str = "Puck"  # Available: Puck, Charon, Kore, Fenrir, Aoede
     GEMINI_TEMPERATURE: float = 0.7
     
-    @classmethod
-    def validate(cls) -> bool:
+    def validate(self, check_storage: bool = True) -> bool:
         """
         Validate that all required configuration is present
         
+        Args:
+            check_storage: Also check cloud storage credentials (processes
+                that never upload, like the agent worker, can skip this)
+            
         Returns:
             True if configuration is valid
             
         Raises:
             ValueError if required configuration is missing
         """
-        required_fields = [
-            ("GOOGLE_API_KEY", cls.GOOGLE_API_KEY),
-            ("LIVEKIT_URL", cls.LIVEKIT_URL),
-            ("LIVEKIT_API_KEY", cls.LIVEKIT_API_KEY),
-            ("LIVEKIT_API_SECRET", cls.LIVEKIT_API_SECRET),
-        ]
-        
         missing_fields = [
-            field_name for field_name, field_value in required_fields
-            if not field_value
+            field_name for field_name in _REQUIRED_FIELDS
+            if not getattr(self, field_name)
         ]
         
         if missing_fields:
@@ -99,9 +110,9 @@ class Config:
             )
             
         # Validate cloud storage configuration if enabled
-        if cls.USE_CLOUD_STORAGE:
-            if not (cls.AWS_ACCESS_KEY and cls.AWS_SECRET_KEY):
-                if not cls.GCS_BUCKET:
+        if check_storage and self.USE_CLOUD_STORAGE:
+            if not (self.AWS_ACCESS_KEY and self.AWS_SECRET_KEY):
+                if not self.GCS_BUCKET:
                     raise ValueError(
                         "Cloud storage enabled but no storage credentials found. "
                         "Set AWS credentials or GCS_BUCKET."
@@ -109,31 +120,45 @@ class Config:
                     
         return True
         
-    @classmethod
-    def get_storage_config(cls) -> dict:
-        """Get storage configuration based on settings"""
-        if cls.USE_CLOUD_STORAGE:
-            if cls.AWS_ACCESS_KEY and cls.AWS_SECRET_KEY:
+    def get_storage_config(self) -> Mapping:
+        """
+        Get storage configuration based on settings
+        
+        Settings don't change after import, so the result is computed once
+        and returned as a read-only mapping shared by all callers.
+        """
+        return _storage_config(self)
+        
+    def _build_storage_config(self) -> dict:
+        if self.USE_CLOUD_STORAGE:
+            if self.AWS_ACCESS_KEY and self.AWS_SECRET_KEY:
                 return {
                     "type": "s3",
-                    "access_key": cls.AWS_ACCESS_KEY,
-                    "secret_key": cls.AWS_SECRET_KEY,
-                    "region": cls.AWS_REGION,
-                    "bucket": cls.AWS_BUCKET,
+                    "access_key": self.AWS_ACCESS_KEY,
+                    "secret_key": self.AWS_SECRET_KEY,
+                    "region": self.AWS_REGION,
+                    "bucket": self.AWS_BUCKET,
                 }
-            elif cls.GCS_BUCKET:
+            elif self.GCS_BUCKET:
                 return {
                     "type": "gcs",
-                    "bucket": cls.GCS_BUCKET,
-                    "credentials": cls.GOOGLE_APPLICATION_CREDENTIALS,
+                    "bucket": self.GCS_BUCKET,
+                    "credentials": self.GOOGLE_APPLICATION_CREDENTIALS,
                 }
         
         return {
             "type": "local",
-            "directory": cls.RECORDINGS_DIR,
+            "directory": self.RECORDINGS_DIR,
         }
 
 
+@lru_cache(maxsize=None)
+def _storage_config(cfg: Config) -> Mapping:
+    # Config is frozen and hashable, so the mapping is cached per instance
+    # without mutating it
+    return MappingProxyType(cfg._build_storage_config())
+
+
 # Create config instance
 config = Config()
 
@@ -154,7 +179,9 @@ def setup_logging():
     logging.getLogger("livekit").setLevel(logging.WARNING)
     logging.getLogger("google").setLevel(logging.WARNING)
     
-    return logging.getLogger(__name__)
+    logger = logging.getLogger(__name__)
+    logger.debug(f"LiveKit URL: {config.LIVEKIT_URL}")
+    return logger
 
 
 def setup_directories():
@@ -171,10 +198,11 @@ def setup_directories():
         os.makedirs(directory, exist_ok=True)
 
 
-# Initialize on import
+# Initialize on import (cloud storage settings are checked by the code
+# that uploads, so importing config never rejects them)
+setup_directories()
 try:
-    config.validate()
-    setup_directories()
+    config.validate(check_storage=False)
 except ValueError as e:
     print(f"Configuration Error: {e}")
     print("Please check your .env file and ensure all required variables are set.")
\ No newline at end of file
@@ -4,51 +4,27 @@ Automated evaluation and scoring of interview transcripts
 """
 
 import os
+import re
+import asyncio
 import json
 import logging
-from typing import Dict, Optional
+import orjson
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple, Union
 from datetime import datetime
-import google.generativeai as genai
+from pathlib import Path
+
+try:
+    from timestamps import file_timestamp
+except ImportError:  # imported as src.evaluator
+    from .timestamps import file_timestamp
 
 logger = logging.getLogger(__name__)
 
 
-class InterviewEvaluator:
-    """Evaluates interview performance using AI"""
-    
-    def __init__(self, api_key: Optional[str] = None):
-        """
-        Initialize the evaluator
-        
-        Args:
-            api_key: Google API key (uses GOOGLE_API_KEY env var if not provided)
-        """
-        api_key = api_key or os.getenv("GOOGLE_API_KEY")
-        if not api_key:
-            raise ValueError("GOOGLE_API_KEY not found")
-            
-        genai.configure(api_key=api_key)
-        self.model = genai.GenerativeModel("gemini-2.0-flash-exp")
-        
-    async def evaluate_interview(
-        self,
-        transcript: str,
-        job_role: str,
-        candidate_id: str
-    ) -> Dict:
-        """
-        Generate comprehensive evaluation based on interview transcript
-        
-        Args:
-            transcript: Interview transcript text
-            job_role: Job role being interviewed for
-            candidate_id: Candidate identifier
-            
-        Returns:
-            Evaluation dictionary with scores and feedback
-        """
-        try:
-            evaluation_prompt = f"""
+# Prompt templates are built once at import; only the per-call values are
+# substituted with str.format (literal JSON braces are doubled)
+EVALUATION_PROMPT_TEMPLATE = """
 Analyze this interview transcript for a {job_role} position.
 
 Transcript:
@@ -101,21 +77,131 @@ Guidelines:
 
 Return ONLY valid JSON, no additional text.
 """
+
+FEEDBACK_PROMPT_TEMPLATE = """
+Create a professional, encouraging feedback email for {candidate_name} based on their interview evaluation.
+
+Evaluation Summary:
+- Overall Score: {overall_score}/10
+- Recommendation: {recommendation}
+- Strengths: {strengths}
+- Areas for Improvement: {areas_for_improvement}
+- Detailed Feedback: {detailed_feedback}
+
+Requirements:
+- Be professional and encouraging
+- Thank them for their time
+- Highlight their strengths specifically
+- If areas for improvement exist, phrase constructively
+- Be warm and personable
+- Close with appropriate next steps
+- Sign off from {company_name} Hiring Team
+
+DO NOT include:
+- Specific numerical scores
+- Harsh criticism
+- Anything that could be legally problematic
+
+Return only the email body, no subject line.
+"""
+
+COMPARISON_PROMPT_TEMPLATE = """
+Compare these candidates for a {job_role} position:
+
+{candidates_summary}
+
+Provide a comparison analysis in JSON format:
+{{
+    "ranking": [
+        {{
+            "candidate_id": "id",
+            "rank": 1,
+            "reasoning": "why they rank here"
+        }}
+    ],
+    "top_candidate": {{
+        "candidate_id": "id",
+        "why": "detailed reasoning"
+    }},
+    "key_differentiators": [
+        "differentiator 1",
+        "differentiator 2"
+    ],
+    "hiring_recommendation": "Overall recommendation for the hiring team"
+}}
+
+Return ONLY valid JSON.
+"""
+
+# Maximum number of generated feedback emails kept per evaluator
+FEEDBACK_EMAIL_CACHE_SIZE = 256
+
+# Markdown code fence around a JSON response, e.g. ```json ... ```
+_FENCE_RE = re.compile(r"\A```(?:json)?\s*|\s*```\Z")
+
+
+def _strip_code_fences(text: str) -> str:
+    """Remove a surrounding markdown code fence from a model response"""
+    text = text.strip()
+    # Most responses are bare JSON; only run the regex when a fence is present
+    if text.startswith("```"):
+        text = _FENCE_RE.sub("", text)
+    return text
+
+
+class InterviewEvaluator:
+    """Evaluates interview performance using AI"""
+    
+    def __init__(self, api_key: Optional[str] = None):
+        """
+        Initialize the evaluator
+        
+        Args:
+            api_key: Google API key (uses GOOGLE_API_KEY env var if not provided)
+        """
+        api_key = api_key or os.getenv("GOOGLE_API_KEY")
+        if not api_key:
+            raise ValueError("GOOGLE_API_KEY not found")
             
-            response = await self.model.generate_content_async(evaluation_prompt)
+        # Imported here so `import evaluator` stays cheap for callers that
+        # only need EvaluationReport (the SDK pulls in gRPC/protobuf)
+        import google.generativeai as genai
+        
+        genai.configure(api_key=api_key)
+        self.model = genai.GenerativeModel("gemini-2.0-flash-exp")
+        
+        # Recently generated feedback emails (LRU), keyed by the filled-in
+        # prompt so retries don't re-query the model
+        self._feedback_emails: "OrderedDict[str, str]" = OrderedDict()
+        
+    async def evaluate_interview(
+        self,
+        transcript: str,
+        job_role: str,
+        candidate_id: str
+    ) -> Dict:
+        """
+        Generate comprehensive evaluation based on interview transcript
+        
+        Args:
+            transcript: Interview transcript text
+            job_role: Job role being interviewed for
+            candidate_id: Candidate identifier
+            
+        Returns:
+            Evaluation dictionary with scores and feedback
+        """
+        try:
+            evaluation_prompt = EVALUATION_PROMPT_TEMPLATE.format(
+                job_role=job_role,
+                transcript=transcript,
+            )
             
-            # Parse JSON response
-            evaluation_text = response.text.strip()
+            response = await self.model.generate_content_async(evaluation_prompt)
             
-            # Remove markdown code blocks if present
-            if evaluation_text.startswith('```json'):
-                evaluation_text = evaluation_text[7:]
-            if evaluation_text.startswith('```'):
-                evaluation_text = evaluation_text[3:]
-            if evaluation_text.endswith('```'):
-                evaluation_text = evaluation_text[:-3]
-                
-            evaluation = json.loads(evaluation_text.strip())
+            # Parse JSON response (removing markdown code blocks if present)
+            evaluation_text = _strip_code_fences(response.text)
+            evaluation = orjson.loads(evaluation_text)
             
             # Add metadata
             evaluation['candidate_id'] = candidate_id
@@ -125,7 +211,7 @@ Return ONLY valid JSON, no additional text.
             logger.info(f"Interview evaluation completed for {candidate_id}")
             return evaluation
             
-        except json.JSONDecodeError as e:
+        except orjson.JSONDecodeError as e:
             logger.error(f"Failed to parse evaluation JSON: {e}")
             logger.error(f"Response text: {response.text}")
             raise
@@ -133,6 +219,36 @@ Return ONLY valid JSON, no additional text.
             logger.error(f"Error evaluating interview: {e}")
             raise
             
+    async def evaluate_batch(
+        self,
+        interviews: List[Tuple[str, str, str]],
+        max_concurrency: int = 5,
+        return_exceptions: bool = True
+    ) -> List[Union[Dict, BaseException]]:
+        """
+        Evaluate several interviews concurrently
+        
+        Args:
+            interviews: (transcript, job_role, candidate_id) tuples
+            max_concurrency: Maximum number of evaluations in flight at once
+            return_exceptions: If True (default), a failed evaluation's
+                exception is returned in its slot and the others are kept;
+                if False, the first failure is raised and the rest discarded
+            
+        Returns:
+            Evaluation dictionaries (or exceptions), in the same order as interviews
+        """
+        semaphore = asyncio.Semaphore(max_concurrency)
+        
+        async def _evaluate(transcript: str, job_role: str, candidate_id: str) -> Dict:
+            async with semaphore:
+                return await self.evaluate_interview(transcript, job_role, candidate_id)
+                
+        return await asyncio.gather(
+            *(_evaluate(*interview) for interview in interviews),
+            return_exceptions=return_exceptions
+        )
+        
     async def generate_feedback_email(
         self,
         evaluation: Dict,
@@ -151,35 +267,29 @@ Return ONLY valid JSON, no additional text.
             Formatted email text
         """
         try:
-            feedback_prompt = f"""
-Create a professional, encouraging feedback email for {candidate_name} based on their interview evaluation.
-
-Evaluation Summary:
-- Overall Score: {evaluation.get('overall_score', 'N/A')}/10
-- Recommendation: {evaluation.get('recommendation', 'N/A')}
-- Strengths: {', '.join(evaluation.get('strengths', []))}
-- Areas for Improvement: {', '.join(evaluation.get('areas_for_improvement', []))}
-- Detailed Feedback: {evaluation.get('detailed_feedback', '')}
-
-Requirements:
-- Be professional and encouraging
-- Thank them for their time
-- Highlight their strengths specifically
-- If areas for improvement exist, phrase constructively
-- Be warm and personable
-- Close with appropriate next steps
-- Sign off from {company_name} Hiring Team
-
-DO NOT include:
-- Specific numerical scores
-- Harsh criticism
-- Anything that could be legally problematic
-
-Return only the email body, no subject line.
-"""
+            feedback_prompt = FEEDBACK_PROMPT_TEMPLATE.format(
+                candidate_name=candidate_name,
+                overall_score=evaluation.get('overall_score', 'N/A'),
+                recommendation=evaluation.get('recommendation', 'N/A'),
+                strengths=', '.join(evaluation.get('strengths', [])),
+                areas_for_improvement=', '.join(evaluation.get('areas_for_improvement', [])),
+                detailed_feedback=evaluation.get('detailed_feedback', ''),
+                company_name=company_name,
+            )
             
+            # The prompt holds every input to the email, so an edited
+            # evaluation never matches a stale entry
+            cached = self._feedback_emails.get(feedback_prompt)
+            if cached is not None:
+                self._feedback_emails.move_to_end(feedback_prompt)
+                logger.debug(f"Reusing feedback email for {candidate_name}")
+                return cached
+                
             response = await self.model.generate_content_async(feedback_prompt)
             email_body = response.text.strip()
+            self._feedback_emails[feedback_prompt] = email_body
+            if len(self._feedback_emails) > FEEDBACK_EMAIL_CACHE_SIZE:
+                self._feedback_emails.popitem(last=False)
             
             logger.info(f"Feedback email generated for {candidate_name}")
             return email_body
@@ -215,45 +325,15 @@ Return only the email body, no subject line.
                     'technical_score': eval.get('detailed_scores', {}).get('technical_competency', 0),
                 })
                 
-            comparison_prompt = f"""
-Compare these candidates for a {job_role} position:
-
-{json.dumps(candidates_summary, indent=2)}
-
-Provide a comparison analysis in JSON format:
-{{
-    "ranking": [
-        {{
-            "candidate_id": "id",
-            "rank": 1,
-            "reasoning": "why they rank here"
-        }}
-    ],
-    "top_candidate": {{
-        "candidate_id": "id",
-        "why": "detailed reasoning"
-    }},
-    "key_differentiators": [
-        "differentiator 1",
-        "differentiator 2"
-    ],
-    "hiring_recommendation": "Overall recommendation for the hiring team"
-}}
-
-Return ONLY valid JSON.
-"""
+            comparison_prompt = COMPARISON_PROMPT_TEMPLATE.format(
+                job_role=job_role,
+                candidates_summary=json.dumps(candidates_summary, indent=2),
+            )
             
             response = await self.model.generate_content_async(comparison_prompt)
             
-            comparison_text = response.text.strip()
-            if comparison_text.startswith('```json'):
-                comparison_text = comparison_text[7:]
-            if comparison_text.startswith('```'):
-                comparison_text = comparison_text[3:]
-            if comparison_text.endswith('```'):
-                comparison_text = comparison_text[:-3]
-                
-            comparison = json.loads(comparison_text.strip())
+            comparison_text = _strip_code_fences(response.text)
+            comparison = orjson.loads(comparison_text)
             comparison['compared_at'] = datetime.now().isoformat()
             comparison['job_role'] = job_role
             
@@ -271,16 +351,18 @@ Return ONLY valid JSON.
             evaluation: Evaluation dictionary
             output_dir: Directory to save evaluations
         """
-        os.makedirs(output_dir, exist_ok=True)
-        
         candidate_id = evaluation.get('candidate_id', 'unknown')
-        timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+        timestamp = file_timestamp()
         filename = f"{candidate_id}_{timestamp}.json"
         filepath = os.path.join(output_dir, filename)
         
         try:
-            with open(filepath, 'w') as f:
-                json.dump(evaluation, f, indent=2)
+            os.makedirs(output_dir, exist_ok=True)
+            
+            # Write to a temp file and rename so readers never see a partial file
+            tmp_path = Path(filepath + ".tmp")
+            tmp_path.write_bytes(orjson.dumps(evaluation, option=orjson.OPT_INDENT_2))
+            os.replace(tmp_path, filepath)
                 
             logger.info(f"Evaluation saved: {filepath}")
             return filepath
@@ -304,7 +386,7 @@ class EvaluationReport:
         Returns:
             Markdown formatted report
         """
-        report = f"""# Interview Evaluation Report
+        parts = [f"""# Interview Evaluation Report
 
 ## Candidate Information
 - **Candidate ID**: {evaluation.get('candidate_id', 'N/A')}
@@ -316,39 +398,39 @@ class EvaluationReport:
 - **Recommendation**: **{evaluation.get('recommendation', 'N/A')}**
 
 ## Detailed Scores
-"""
+"""]
         
         detailed_scores = evaluation.get('detailed_scores', {})
         for category, score in detailed_scores.items():
             category_name = category.replace('_', ' ').title()
-            report += f"- **{category_name}**: {score}/10\n"
+            parts.append(f"- **{category_name}**: {score}/10\n")
             
-        report += "\n## Strengths\n"
+        parts.append("\n## Strengths\n")
         for strength in evaluation.get('strengths', []):
-            report += f"- {strength}\n"
+            parts.append(f"- {strength}\n")
             
-        report += "\n## Areas for Improvement\n"
+        parts.append("\n## Areas for Improvement\n")
         for area in evaluation.get('areas_for_improvement', []):
-            report += f"- {area}\n"
+            parts.append(f"- {area}\n")
             
-        report += "\n## Key Observations\n"
+        parts.append("\n## Key Observations\n")
         for observation in evaluation.get('key_observations', []):
-            report += f"- {observation}\n"
+            parts.append(f"- {observation}\n")
             
         if evaluation.get('standout_moments'):
-            report += "\n## Standout Moments\n"
+            parts.append("\n## Standout Moments\n")
             for moment in evaluation.get('standout_moments', []):
-                report += f"- {moment}\n"
+                parts.append(f"- {moment}\n")
                 
         if evaluation.get('concerns'):
-            report += "\n## Concerns\n"
+            parts.append("\n## Concerns\n")
             for concern in evaluation.get('concerns', []):
-                report += f"- {concern}\n"
+                parts.append(f"- {concern}\n")
                 
-        report += f"\n## Detailed Feedback\n\n{evaluation.get('detailed_feedback', 'N/A')}\n"
-        report += f"\n## Next Steps\n\n{evaluation.get('next_steps_recommendation', 'N/A')}\n"
+        parts.append(f"\n## Detailed Feedback\n\n{evaluation.get('detailed_feedback', 'N/A')}\n")
+        parts.append(f"\n## Next Steps\n\n{evaluation.get('next_steps_recommendation', 'N/A')}\n")
         
-        return report
+        return "".join(parts)
         
     @staticmethod
     def save_markdown_report(evaluation: Dict, output_path: str):
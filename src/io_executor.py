@@ -0,0 +1,30 @@
+"""
+I/O Executor
+Dedicated thread pool for blocking disk I/O from async code
+"""
+
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+
+# Threads are created on demand, so a large cap costs nothing when idle.
+# Keeps recorder/transcript I/O from queueing behind other users of the
+# loop's default executor (DNS resolution, etc.)
+_IO_EXECUTOR = ThreadPoolExecutor(max_workers=64, thread_name_prefix="agent-io")
+
+
+async def run_io(fn, *args, **kwargs):
+    """
+    Run a blocking function on the shared I/O executor
+    
+    Args:
+        fn: Blocking callable
+        *args, **kwargs: Arguments passed to fn
+        
+    Returns:
+        Whatever fn returns
+    """
+    loop = asyncio.get_running_loop()
+    if kwargs:
+        fn = partial(fn, **kwargs)
+    return await loop.run_in_executor(_IO_EXECUTOR, fn, *args)
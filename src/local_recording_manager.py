@@ -9,6 +9,11 @@ from typing import Optional
 from datetime import datetime
 from pathlib import Path
 
+try:
+    from timestamps import file_timestamp
+except ImportError:  # imported as src.local_recording_manager
+    from .timestamps import file_timestamp
+
 logger = logging.getLogger(__name__)
 
 
@@ -22,12 +27,10 @@ class LocalRecordingManager:
         self.recording_started = False
         self.candidate_id: Optional[str] = None
         self.start_time: Optional[datetime] = None
+        self.session_stamp: Optional[str] = None
+        # Created once per process by config.setup_directories() at import
         self.recordings_dir = Path("recordings")
         
-        # Ensure recordings directory exists
-        self.recordings_dir.mkdir(exist_ok=True)
-        logger.info(f"Local recordings directory: {self.recordings_dir.absolute()}")
-        
     def start_recording(self, room_name: str, candidate_id: str) -> str:
         """
         Mark recording as started (actual recording happens on client)
@@ -41,9 +44,10 @@ class LocalRecordingManager:
         """
         self.candidate_id = candidate_id
         self.start_time = datetime.now()
+        self.session_stamp = file_timestamp(self.start_time)
         self.recording_started = True
         
-        recording_id = f"{candidate_id}_{self.start_time.strftime('%Y%m%d_%H%M%S')}"
+        recording_id = f"{candidate_id}_{self.session_stamp}"
         
         logger.info(f"Recording started for candidate: {candidate_id}")
         logger.info(f"Recording ID: {recording_id}")
@@ -79,9 +83,14 @@ class LocalRecordingManager:
         }
     
     def get_recording_path(self, candidate_id: str, timestamp: str = None) -> Path:
-        """Get the expected path for a recording file"""
+        """
+        Get the expected path for a recording file
+        
+        Defaults to the timestamp taken at start_recording, so every path
+        built during a session matches the recording ID.
+        """
         if timestamp is None:
-            timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+            timestamp = self.session_stamp or file_timestamp()
         filename = f"{candidate_id}_{timestamp}.webm"
         return self.recordings_dir / filename
     
@@ -89,28 +98,18 @@ class LocalRecordingManager:
         """List all local recordings"""
         recordings = []
         
-        for file in self.recordings_dir.glob("*.webm"):
-            stat = file.stat()
-            recordings.append({
-                "filename": file.name,
-                "path": str(file.absolute()),
-                "size_mb": stat.st_size / (1024 * 1024),
-                "created": datetime.fromtimestamp(stat.st_ctime).isoformat()
-            })
+        # One directory pass; DirEntry caches its stat result
+        with os.scandir(self.recordings_dir.absolute()) as entries:
+            for entry in entries:
+                if not entry.name.endswith(".webm") or not entry.is_file():
+                    continue
+                stat = entry.stat()
+                recordings.append({
+                    "filename": entry.name,
+                    "path": entry.path,
+                    "size_mb": stat.st_size / (1024 * 1024),
+                    "created": datetime.fromtimestamp(stat.st_ctime).isoformat()
+                })
         
         return recordings
 
-
-# Alternative: Server-side recording using ffmpeg (for self-hosted LiveKit only)
-class ServerSideRecordingManager:
-    """
-    Server-side recording manager
-    Only works with self-hosted LiveKit + Egress service
-    """
-    
-    def __init__(self):
-        logger.warning(
-            "Server-side recording requires self-hosted LiveKit with Egress service. "
-            "LiveKit Cloud free tier does not support this. "
-            "Consider using client-side recording instead."
-        )
\ No newline at end of file
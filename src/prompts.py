@@ -3,6 +3,9 @@ Interview Prompts
 Customized prompts for different job roles
 """
 
+from functools import lru_cache
+from typing import Tuple
+
 INTERVIEW_PROMPTS = {
     "software_engineer": """
 You are a professional technical interviewer conducting a one-on-one interview for a Software Engineer position.
@@ -303,10 +306,21 @@ Important Guidelines:
 """,
 }
 
+# Roles never change at runtime, so the tuple is built once
+_ROLES: Tuple[str, ...] = tuple(INTERVIEW_PROMPTS)
+
+# Fallback for unknown roles
+_DEFAULT_PROMPT = INTERVIEW_PROMPTS["software_engineer"]
 
+
+@lru_cache(maxsize=16)
 def get_interview_prompt(job_role: str) -> str:
     """
     Get the appropriate interview prompt for a job role
+
+    Results are cached per role so every session for the same role passes
+    the exact same instructions object to Gemini, keeping the system prompt
+    a stable prefix for the model's prefix cache.
     
     Args:
         job_role: The job role identifier
@@ -314,12 +328,9 @@ def get_interview_prompt(job_role: str) -> str:
     Returns:
         Interview prompt string
     """
-    return INTERVIEW_PROMPTS.get(
-        job_role,
-        INTERVIEW_PROMPTS["software_engineer"]  # Default fallback
-    )
+    return INTERVIEW_PROMPTS.get(job_role) or _DEFAULT_PROMPT
 
 
-def list_available_roles() -> list:
-    """Get list of all available job roles"""
-    return list(INTERVIEW_PROMPTS.keys())
+def list_available_roles() -> Tuple[str, ...]:
+    """Get all available job roles"""
+    return _ROLES
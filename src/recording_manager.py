@@ -5,12 +5,87 @@ Handles interview recording using LiveKit Egress API
 
 import os
 import logging
-from typing import Optional, Dict
+import orjson
+from dataclasses import dataclass
+from typing import Optional, Dict, List, Tuple
 from datetime import datetime
 from livekit import api
 
+try:
+    from config import config
+    from timestamps import file_timestamp
+except ImportError:  # imported as src.recording_manager
+    from .config import config
+    from .timestamps import file_timestamp
+
 logger = logging.getLogger(__name__)
 
+@dataclass(frozen=True, slots=True)
+class S3Config:
+    """S3 upload settings, taken from config once at import"""
+    enabled: bool
+    access_key: str
+    secret: str
+    region: str
+    bucket: str
+    
+    def as_kwargs(self) -> dict:
+        """Keyword arguments for api.S3Upload"""
+        return {
+            "access_key": self.access_key,
+            "secret": self.secret,
+            "region": self.region,
+            "bucket": self.bucket,
+        }
+
+
+def _load_s3_config() -> S3Config:
+    # Upload only when config resolves storage to S3 (cloud storage enabled
+    # and AWS credentials set); GCS isn't supported by this manager
+    enabled = config.get_storage_config()["type"] == "s3"
+    if config.USE_CLOUD_STORAGE and not enabled:
+        logger.warning("USE_CLOUD_STORAGE is set but no AWS credentials found, recording locally")
+    return S3Config(
+        enabled=enabled,
+        access_key=config.AWS_ACCESS_KEY,
+        secret=config.AWS_SECRET_KEY,
+        region=config.AWS_REGION,
+        bucket=config.AWS_BUCKET,
+    )
+
+
+_S3_CONFIG = _load_s3_config()
+
+# Process-wide LiveKit API clients, keyed by (url, api_key, api_secret)
+_livekit_api_clients: Dict[Tuple[str, str, str], api.LiveKitAPI] = {}
+
+
+def get_livekit_api(livekit_url: str, api_key: str, api_secret: str) -> api.LiveKitAPI:
+    """
+    Get the shared LiveKit API client for these credentials
+    
+    The client owns a pooled HTTP session, so reusing it avoids a new
+    TCP/TLS handshake on every recording start/stop.
+    """
+    key = (livekit_url, api_key, api_secret)
+    client = _livekit_api_clients.get(key)
+    if client is None:
+        client = api.LiveKitAPI(livekit_url, api_key, api_secret)
+        _livekit_api_clients[key] = client
+    return client
+
+
+async def close_livekit_api():
+    """
+    Close all shared LiveKit API clients
+    
+    Call once when the process shuts down, not per job or session: the
+    clients are shared by everything running in the process.
+    """
+    while _livekit_api_clients:
+        _, client = _livekit_api_clients.popitem()
+        await client.aclose()
+
 
 class RecordingManager:
     """Manages interview recording using LiveKit Egress"""
@@ -27,11 +102,11 @@ class RecordingManager:
         self.livekit_url = livekit_url
         self.api_key = api_key
         self.api_secret = api_secret
-        self.egress_service = api.EgressService(
+        self.egress_service = get_livekit_api(
             livekit_url,
             api_key,
             api_secret
-        )
+        ).egress
         self.egress_id: Optional[str] = None
         self.recording_start_time: Optional[datetime] = None
         
@@ -53,24 +128,19 @@ class RecordingManager:
             Egress ID for the recording
         """
         try:
-            timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+            timestamp = file_timestamp()
             filename = f"{candidate_id}_{timestamp}"
             
             # Configure recording output
             # For production, use S3 or other cloud storage
             # For development, use local file storage
             
-            if os.getenv("USE_CLOUD_STORAGE") == "true":
+            if _S3_CONFIG.enabled:
                 # Cloud storage (S3)
                 output = api.EncodedFileOutput(
                     file_type=api.EncodedFileType.MP4,
                     filepath=f"recordings/{filename}.mp4",
-                    output=api.S3Upload(
-                        access_key=os.getenv("AWS_ACCESS_KEY"),
-                        secret=os.getenv("AWS_SECRET_KEY"),
-                        region=os.getenv("AWS_REGION", "us-east-1"),
-                        bucket=os.getenv("AWS_BUCKET", "interview-recordings")
-                    )
+                    output=api.S3Upload(**_S3_CONFIG.as_kwargs())
                 )
             else:
                 # Local file storage (for development)
@@ -185,17 +255,16 @@ class RecordingManager:
         try:
             egress_list = await self.egress_service.list_egress(room_name=room_name)
             
-            recordings = []
-            for egress in egress_list:
-                recordings.append({
+            return [
+                {
                     'egress_id': egress.egress_id,
                     'room_name': egress.room_name,
                     'status': egress.status,
                     'started_at': egress.started_at,
                     'ended_at': egress.ended_at,
-                })
-                
-            return recordings
+                }
+                for egress in egress_list
+            ]
             
         except Exception as e:
             logger.error(f"Failed to list recordings: {e}")
@@ -203,11 +272,19 @@ class RecordingManager:
 
 
 class RecordingMetadata:
-    """Store metadata about recordings"""
+    """Store metadata about recordings (one JSON object per line)"""
     
     def __init__(self, recordings_dir: str = "recordings"):
         self.recordings_dir = recordings_dir
-        self.metadata_file = os.path.join(recordings_dir, "metadata.json")
+        self.metadata_file = os.path.join(recordings_dir, "metadata.jsonl")
+        # Metadata written before the switch to JSONL
+        self.legacy_metadata_file = os.path.join(recordings_dir, "metadata.json")
+        self._legacy_checked = False
+        
+        # candidate_id -> byte offsets of that candidate's lines, built
+        # incrementally from the part of the file not yet indexed
+        self._index: Dict[str, List[int]] = {}
+        self._indexed_size = 0
         
     def save_metadata(
         self,
@@ -219,8 +296,6 @@ class RecordingMetadata:
         file_path: str
     ):
         """Save recording metadata"""
-        import json
-        
         metadata = {
             'candidate_id': candidate_id,
             'room_name': room_name,
@@ -231,32 +306,78 @@ class RecordingMetadata:
             'recorded_at': datetime.now().isoformat(),
         }
         
-        # Load existing metadata
-        all_metadata = []
-        if os.path.exists(self.metadata_file):
-            with open(self.metadata_file, 'r') as f:
-                all_metadata = json.load(f)
-                
-        # Append new metadata
-        all_metadata.append(metadata)
+        self._migrate_legacy_metadata()
         
-        # Save back
-        with open(self.metadata_file, 'w') as f:
-            json.dump(all_metadata, f, indent=2)
+        # Append-only: each save writes one line instead of rewriting the history
+        with open(self.metadata_file, 'ab') as f:
+            f.write(orjson.dumps(metadata) + b'\n')
             
         logger.info(f"Metadata saved for candidate {candidate_id}")
         
     def get_candidate_recordings(self, candidate_id: str) -> list:
         """Get all recordings for a specific candidate"""
-        import json
-        
+        self._migrate_legacy_metadata()
         if not os.path.exists(self.metadata_file):
             return []
             
-        with open(self.metadata_file, 'r') as f:
-            all_metadata = json.load(f)
+        with open(self.metadata_file, 'rb') as f:
+            self._refresh_index(f)
+            recordings = []
+            for offset in self._index.get(candidate_id, ()):
+                f.seek(offset)
+                recordings.append(orjson.loads(f.readline()))
+                
+        return recordings
+        
+    def _migrate_legacy_metadata(self):
+        """
+        Convert an existing metadata.json to metadata.jsonl once
+        
+        Records are copied in their original order; the old file is kept as
+        metadata.json.migrated so it isn't converted again.
+        """
+        if self._legacy_checked:
+            return
+        self._legacy_checked = True
+        if not os.path.exists(self.legacy_metadata_file):
+            return
+            
+        with open(self.legacy_metadata_file, 'rb') as f:
+            legacy = orjson.loads(f.read())
+        lines = b''.join(orjson.dumps(rec) + b'\n' for rec in legacy)
+        
+        # Legacy records go first, ahead of anything already appended
+        existing = b''
+        if os.path.exists(self.metadata_file):
+            with open(self.metadata_file, 'rb') as f:
+                existing = f.read()
+        tmp_path = self.metadata_file + ".tmp"
+        with open(tmp_path, 'wb') as f:
+            f.write(lines + existing)
+        os.replace(tmp_path, self.metadata_file)
+        os.replace(self.legacy_metadata_file, self.legacy_metadata_file + ".migrated")
+        
+        # Offsets have shifted
+        self._index.clear()
+        self._indexed_size = 0
+        logger.info(f"Migrated {len(legacy)} recording(s) from {self.legacy_metadata_file}")
+        
+    def _refresh_index(self, f):
+        """Index lines appended since the last lookup (the file is append-only)"""
+        size = os.fstat(f.fileno()).st_size
+        if size < self._indexed_size:
+            # File was replaced or truncated; start over
+            self._index.clear()
+            self._indexed_size = 0
+        if size == self._indexed_size:
+            return
             
-        return [
-            rec for rec in all_metadata
-            if rec['candidate_id'] == candidate_id
-        ]
+        f.seek(self._indexed_size)
+        offset = self._indexed_size
+        for line in f:
+            if not line.endswith(b'\n'):
+                break  # partial line from a concurrent append; index it next time
+            rec = orjson.loads(line)
+            self._index.setdefault(rec['candidate_id'], []).append(offset)
+            offset += len(line)
+        self._indexed_size = offset
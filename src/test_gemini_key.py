@@ -9,6 +9,26 @@ from pathlib import Path
 env_path = Path(__file__).parent / '.env'
 load_dotenv(env_path)
 
+# Add config to avoid 1007 errors
+LIVE_CONFIG = {
+    "response_modalities": ["AUDIO"],
+    "speech_config": {
+        "voice_config": {
+            "prebuilt_voice_config": {
+                "voice_name": "Puck"
+            }
+        }
+    }
+}
+
+async def probe(client, version, model_name):
+    try:
+        async with client.aio.live.connect(model=model_name, config=LIVE_CONFIG) as session:
+            return True, f"✅ SUCCESS! {model_name} CONNECTED via {version}."
+    except Exception as e:
+        msg = str(e)
+        return False, f"❌ {model_name} ({version}) FAILED: {msg[:150]}"
+
 async def test_key():
     api_key = os.getenv("GOOGLE_API_KEY")
     if not api_key:
@@ -25,32 +45,22 @@ async def test_key():
     
     versions = ["v1beta", "v1alpha"]
     
+    # Probe one API version at a time with its models in parallel, so at
+    # most len(candidates) live sessions are open at once; results are
+    # printed in candidate order to keep the output deterministic
     for version in versions:
         print(f"\n--- Testing API Version: {version} ---")
         client = genai.Client(api_key=api_key, http_options={'api_version': version})
-        
-        for model_name in candidates:
+        results = await asyncio.gather(
+            *(probe(client, version, model_name) for model_name in candidates)
+        )
+
+        for model_name, (ok, message) in zip(candidates, results):
             print(f"Testing {model_name}...")
-            try:
-                # Add config to avoid 1007 errors
-                config = {
-                    "response_modalities": ["AUDIO"],
-                    "speech_config": {
-                        "voice_config": {
-                            "prebuilt_voice_config": {
-                                "voice_name": "Puck"
-                            }
-                        }
-                    }
-                }
-                
-                async with client.aio.live.connect(model=model_name, config=config) as session:
-                    print(f"✅ SUCCESS! {model_name} CONNECTED via {version}.")
-                    print(f"🚀 THIS MODEL WORKS WITH YOUR KEY!")
-                    return
-            except Exception as e:
-                msg = str(e)
-                print(f"❌ {model_name} ({version}) FAILED: {msg[:150]}")
+            print(message)
+            if ok:
+                print(f"🚀 THIS MODEL WORKS WITH YOUR KEY!")
+                return
 
 if __name__ == "__main__":
     asyncio.run(test_key())
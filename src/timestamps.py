@@ -0,0 +1,28 @@
+"""
+Timestamps
+Filename-safe timestamp formatting shared by recordings, transcripts and evaluations
+"""
+
+import time
+from datetime import datetime
+from typing import Optional
+
+
+def file_timestamp(dt: Optional[datetime] = None) -> str:
+    """
+    Format a local time as YYYYMMDD_HHMMSS for use in filenames
+    
+    Equivalent to strftime('%Y%m%d_%H%M%S') without the format-string parsing
+    and locale lookup strftime does on every call.
+    
+    Args:
+        dt: Time to format (defaults to now)
+        
+    Returns:
+        Timestamp string, e.g. "20240131_142501"
+    """
+    t = dt.timetuple() if dt is not None else time.localtime()
+    return (
+        f"{t.tm_year}{t.tm_mon:02d}{t.tm_mday:02d}_"
+        f"{t.tm_hour:02d}{t.tm_min:02d}{t.tm_sec:02d}"
+    )
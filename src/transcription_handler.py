@@ -4,13 +4,52 @@ Manages real-time transcription and transcript storage
 """
 
 import os
-import json
+import re
+import asyncio
 import logging
+import orjson
+from array import array
+from collections import Counter
+from collections.abc import Sequence
 from datetime import datetime
-from typing import List, Dict
+from functools import cached_property
+from itertools import compress
+from typing import Dict, Iterable, List, Optional
+
+try:
+    from io_executor import run_io
+except ImportError:  # imported as src.transcription_handler
+    from .io_executor import run_io
 
 logger = logging.getLogger(__name__)
 
+# Transcript batching (also used by the agent's flusher): buffered entries
+# are written once FLUSH_BATCH_SIZE are pending, or FLUSH_INTERVAL seconds
+# after the first one was buffered, whichever comes first
+FLUSH_BATCH_SIZE = 32
+FLUSH_INTERVAL = 1.0  # seconds
+
+
+class _TranscriptView(Sequence):
+    """Read-only view of a transcript entry list (no copy is made)"""
+    
+    __slots__ = ('_entries',)
+    
+    def __init__(self, entries: List[Dict]):
+        self._entries = entries
+        
+    def __getitem__(self, index):
+        return self._entries[index]
+        
+    def __len__(self) -> int:
+        return len(self._entries)
+        
+    def __iter__(self):
+        return iter(self._entries)
+        
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({self._entries!r})"
+
 
 class TranscriptionHandler:
     """Handles interview transcription"""
@@ -23,7 +62,12 @@ class TranscriptionHandler:
             interview_id: Unique interview identifier
         """
         self.interview_id = interview_id
-        self.transcript: List[Dict] = []
+        # Entries are only added through _append, which keeps the is_final
+        # flags (1/0, for filtering with itertools.compress) and the running
+        # statistics below in step with the list
+        self._entries: List[Dict] = []
+        self._is_final = array('B')
+        self._view = _TranscriptView(self._entries)
         self.transcript_dir = "transcripts"
         self.transcript_file = os.path.join(
             self.transcript_dir,
@@ -33,6 +77,19 @@ class TranscriptionHandler:
         # Ensure transcript directory exists
         os.makedirs(self.transcript_dir, exist_ok=True)
         
+        # Entries from on_transcript not yet written to transcript_file, the
+        # background task that writes them after FLUSH_INTERVAL (set until its
+        # write completes), and a lock so batches reach the file in order
+        self._pending: List[Dict] = []
+        self._flush_timer: Optional[asyncio.Task] = None
+        self._write_lock = asyncio.Lock()
+        
+        # Running statistics over final entries, updated by _append
+        self._final_entries = 0
+        self._total_words = 0
+        self._speaker_counts: Counter = Counter()
+        self._speaker_words: Counter = Counter()
+        
     async def on_transcript(self, event):
         """
         Handle incoming transcription events
@@ -41,25 +98,126 @@ class TranscriptionHandler:
             event: Transcription event from LiveKit
         """
         try:
-            # Extract transcript information
-            transcript_entry = {
-                "timestamp": datetime.now().isoformat(),
-                "speaker": event.participant.identity if hasattr(event, 'participant') else "unknown",
-                "text": event.text if hasattr(event, 'text') else "",
-                "is_final": event.is_final if hasattr(event, 'is_final') else True,
-            }
-            
-            # Add to in-memory transcript
-            self.transcript.append(transcript_entry)
+            # Extract transcript information and add to in-memory transcript
+            transcript_entry = self.add_entry(
+                speaker=event.participant.identity if hasattr(event, 'participant') else "unknown",
+                text=event.text if hasattr(event, 'text') else "",
+                is_final=event.is_final if hasattr(event, 'is_final') else True,
+            )
             
-            # Save to file (append mode)
-            await self.save_transcript_chunk(transcript_entry)
+            # Buffer and append to file in batches
+            self._pending.append(transcript_entry)
+            if len(self._pending) >= FLUSH_BATCH_SIZE:
+                await self.flush()
+            elif self._flush_timer is None:
+                self._flush_timer = asyncio.create_task(self._flush_after_interval())
             
-            logger.debug(f"Transcript: [{transcript_entry['speaker']}] {transcript_entry['text']}")
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("Transcript: [%s] %s", transcript_entry['speaker'], transcript_entry['text'])
             
         except Exception as e:
             logger.error(f"Error processing transcript: {e}")
             
+    @property
+    def transcript(self) -> Sequence:
+        """Read-only view of the transcript entries (use add_entry/add_entries to add)"""
+        return self._view
+        
+    async def flush(self):
+        """
+        Write any entries buffered by on_transcript to the transcript file
+        
+        Also stops the pending background flush; call at session end so the
+        last entries are written without waiting for FLUSH_INTERVAL (until
+        then they are only written while the event loop keeps running).
+        """
+        timer, self._flush_timer = self._flush_timer, None
+        if timer is not None:
+            timer.cancel()
+        await self._write_pending()
+        
+    async def _flush_after_interval(self):
+        try:
+            await asyncio.sleep(FLUSH_INTERVAL)
+            # Shielded so flush() cancelling this task doesn't cut the write
+            # short; flush() then waits for it on the write lock
+            await asyncio.shield(self._write_pending())
+        finally:
+            if self._flush_timer is asyncio.current_task():
+                self._flush_timer = None
+                # Entries buffered while writing get a timer of their own
+                if self._pending:
+                    self._flush_timer = asyncio.create_task(self._flush_after_interval())
+        
+    async def _write_pending(self):
+        async with self._write_lock:
+            pending, self._pending = self._pending, []
+            await self.save_transcript_chunks(pending)
+        
+    def add_entry(self, speaker: str, text: str, is_final: bool = True) -> Dict:
+        """
+        Add a transcript entry to the in-memory transcript without touching disk
+        
+        Args:
+            speaker: Identity of the speaker
+            text: Transcribed text
+            is_final: Whether this is a final transcript
+            
+        Returns:
+            The transcript entry that was added
+        """
+        transcript_entry = {
+            "timestamp": datetime.now().isoformat(),
+            "speaker": speaker,
+            "text": text,
+            "is_final": is_final,
+        }
+        self._append(transcript_entry)
+        return transcript_entry
+        
+    def add_entries(self, entries: Iterable[Dict]):
+        """
+        Add existing transcript entries, e.g. read back from a JSONL file or export
+        
+        Args:
+            entries: Transcript entry dictionaries
+        """
+        for entry in entries:
+            self._append(entry)
+            
+    def _append(self, entry: Dict):
+        is_final = entry.get('is_final', True)
+        self._entries.append(entry)
+        self._is_final.append(1 if is_final else 0)
+        
+        if is_final:
+            speaker = entry.get('speaker', 'Unknown')
+            words = len(entry.get('text', '').split())
+            self._final_entries += 1
+            self._total_words += words
+            self._speaker_counts[speaker] += 1
+            self._speaker_words[speaker] += words
+        
+    async def save_transcript_chunks(self, entries: List[Dict]):
+        """
+        Append a batch of transcript entries to file with a single write
+        
+        Args:
+            entries: Transcript entry dictionaries
+        """
+        if not entries:
+            return
+            
+        lines = b''.join(orjson.dumps(entry) + b'\n' for entry in entries)
+        try:
+            await run_io(self._append_lines, lines)
+        except Exception as e:
+            logger.error(f"Error saving transcript batch: {e}")
+            
+    def _append_lines(self, lines: bytes):
+        with open(self.transcript_file, 'ab') as f:
+            f.write(lines)
+            
     async def save_transcript_chunk(self, entry: Dict):
         """
         Save individual transcript entry to file
@@ -68,8 +226,7 @@ class TranscriptionHandler:
             entry: Transcript entry dictionary
         """
         try:
-            with open(self.transcript_file, 'a') as f:
-                f.write(json.dumps(entry) + '\n')
+            await run_io(self._append_lines, orjson.dumps(entry) + b'\n')
         except Exception as e:
             logger.error(f"Error saving transcript chunk: {e}")
             
@@ -83,25 +240,30 @@ class TranscriptionHandler:
         Returns:
             Formatted transcript string
         """
-        transcript_lines = []
+        # Skip non-final transcripts unless requested
+        entries = self._entries if include_non_final else compress(self._entries, self._is_final)
+        return '\n'.join(self.format_entry(entry) for entry in entries)
         
-        for entry in self.transcript:
-            # Skip non-final transcripts unless requested
-            if not include_non_final and not entry.get('is_final', True):
-                continue
-                
-            timestamp = entry.get('timestamp', '')
-            speaker = entry.get('speaker', 'Unknown')
-            text = entry.get('text', '')
+    @staticmethod
+    def format_entry(entry: Dict) -> str:
+        """
+        Format a single transcript entry as a line of text
+        
+        Args:
+            entry: Transcript entry dictionary
             
-            # Format: [HH:MM:SS] Speaker: Text
-            if timestamp:
-                time_str = timestamp.split('T')[1][:8] if 'T' in timestamp else timestamp[:8]
-                transcript_lines.append(f"[{time_str}] {speaker}: {text}")
-            else:
-                transcript_lines.append(f"{speaker}: {text}")
-                
-        return '\n'.join(transcript_lines)
+        Returns:
+            Line in the form "[HH:MM:SS] Speaker: Text"
+        """
+        timestamp = entry.get('timestamp', '')
+        speaker = entry.get('speaker', 'Unknown')
+        text = entry.get('text', '')
+        
+        if timestamp:
+            # ISO format puts HH:MM:SS at [11:19]; slice instead of split
+            time_str = timestamp[11:19] if timestamp[10:11] == 'T' else timestamp[:8]
+            return f"[{time_str}] {speaker}: {text}"
+        return f"{speaker}: {text}"
         
     def save_formatted_transcript(self, output_path: str = None):
         """
@@ -118,12 +280,14 @@ class TranscriptionHandler:
             
         try:
             formatted = self.get_full_transcript()
+            header = (
+                f"Interview Transcript\n"
+                f"Interview ID: {self.interview_id}\n"
+                f"Generated: {datetime.now().isoformat()}\n"
+                + "=" * 80 + "\n\n"
+            )
             with open(output_path, 'w') as f:
-                f.write(f"Interview Transcript\n")
-                f.write(f"Interview ID: {self.interview_id}\n")
-                f.write(f"Generated: {datetime.now().isoformat()}\n")
-                f.write("=" * 80 + "\n\n")
-                f.write(formatted)
+                f.write(header + formatted)
                 
             logger.info(f"Formatted transcript saved: {output_path}")
             return output_path
@@ -139,34 +303,13 @@ class TranscriptionHandler:
         Returns:
             Dictionary with transcript statistics
         """
-        total_entries = len(self.transcript)
-        final_entries = sum(1 for entry in self.transcript if entry.get('is_final', True))
-        
-        # Count by speaker
-        speaker_counts = {}
-        for entry in self.transcript:
-            if entry.get('is_final', True):
-                speaker = entry.get('speaker', 'Unknown')
-                speaker_counts[speaker] = speaker_counts.get(speaker, 0) + 1
-                
-        # Calculate word counts
-        total_words = 0
-        speaker_words = {}
-        for entry in self.transcript:
-            if entry.get('is_final', True):
-                text = entry.get('text', '')
-                words = len(text.split())
-                total_words += words
-                
-                speaker = entry.get('speaker', 'Unknown')
-                speaker_words[speaker] = speaker_words.get(speaker, 0) + words
-                
+        # Counters are maintained by _append, so this doesn't rescan the transcript
         return {
-            'total_entries': total_entries,
-            'final_entries': final_entries,
-            'speaker_counts': speaker_counts,
-            'total_words': total_words,
-            'speaker_words': speaker_words,
+            'total_entries': len(self._entries),
+            'final_entries': self._final_entries,
+            'speaker_counts': dict(self._speaker_counts),
+            'total_words': self._total_words,
+            'speaker_words': dict(self._speaker_words),
         }
         
     def export_to_json(self, output_path: str = None) -> str:
@@ -190,11 +333,11 @@ class TranscriptionHandler:
                 'interview_id': self.interview_id,
                 'exported_at': datetime.now().isoformat(),
                 'statistics': self.get_transcript_statistics(),
-                'transcript': self.transcript,
+                'transcript': self._entries,
             }
             
-            with open(output_path, 'w') as f:
-                json.dump(export_data, f, indent=2)
+            with open(output_path, 'wb') as f:
+                f.write(orjson.dumps(export_data, option=orjson.OPT_INDENT_2))
                 
             logger.info(f"Transcript exported to JSON: {output_path}")
             return output_path
@@ -204,44 +347,96 @@ class TranscriptionHandler:
             return None
 
 
+# "[HH:MM:SS] Speaker: Text" or "Speaker: Text", as written by format_entry
+_LINE_RE = re.compile(r'(?:\[[^\]]*\]\s*)?(?P<speaker>[^:]*):(?P<text>.*)')
+# Role keywords looked for in the speaker label; interviewer keywords are
+# checked first, so a label matching both (e.g. "user_agent") is the interviewer
+_INTERVIEWER_RE = re.compile(r'agent|interviewer', re.IGNORECASE)
+_CANDIDATE_RE = re.compile(r'candidate|user', re.IGNORECASE)
+
+
 class TranscriptAnalyzer:
     """Analyze interview transcripts"""
     
     def __init__(self, transcript: str):
         self.transcript = transcript
+        self._entries: Optional[List[Dict]] = None
+        
+    @classmethod
+    def from_entries(cls, entries: List[Dict]) -> "TranscriptAnalyzer":
+        """
+        Create an analyzer directly from TranscriptionHandler.transcript entries
+        
+        Speakers are read from each entry's speaker field, so the transcript
+        doesn't have to be formatted to text and parsed back.
+        
+        Args:
+            entries: Transcript entry dictionaries
+            
+        Returns:
+            TranscriptAnalyzer over the final entries
+        """
+        analyzer = cls("")
+        analyzer._entries = entries
+        return analyzer
+        
+    def _turns(self):
+        """Yield (speaker, text, word_count) for each speaker turn"""
+        if self._entries is not None:
+            for entry in self._entries:
+                if not entry.get('is_final', True):
+                    continue
+                text = entry.get('text', '').strip()
+                yield entry.get('speaker', ''), text, len(text.split())
+            return
+            
+        for line in self.transcript.split('\n'):
+            match = _LINE_RE.match(line)
+            if match:
+                # Count only the spoken words, not the timestamp or speaker label
+                text = match.group('text').strip()
+                yield match.group('speaker'), text, len(text.split())
+                
+    @cached_property
+    def _analysis(self) -> Dict:
+        """
+        Classify every turn by speaker role in a single pass
+        
+        Computed on first use and shared by the extract/ratio methods, which
+        callers usually invoke together on the same transcript.
+        
+        Returns:
+            Dictionary with questions, responses and per-role word counts
+        """
+        questions = []
+        responses = []
+        interviewer_words = 0
+        candidate_words = 0
+        
+        for speaker, text, word_count in self._turns():
+            if _INTERVIEWER_RE.search(speaker):
+                interviewer_words += word_count
+                if '?' in text:
+                    questions.append(text)
+            elif _CANDIDATE_RE.search(speaker):
+                candidate_words += word_count
+                if text:  # Skip empty responses
+                    responses.append(text)
+                    
+        return {
+            'questions': questions,
+            'responses': responses,
+            'interviewer_words': interviewer_words,
+            'candidate_words': candidate_words,
+        }
         
     def extract_questions(self) -> List[str]:
         """Extract questions asked by the interviewer"""
-        questions = []
-        lines = self.transcript.split('\n')
-        
-        for line in lines:
-            # Look for lines from the interviewer (agent) with question marks
-            if 'agent' in line.lower() or 'interviewer' in line.lower():
-                if '?' in line:
-                    # Extract the text after the speaker label
-                    parts = line.split(':', 1)
-                    if len(parts) > 1:
-                        question = parts[1].strip()
-                        questions.append(question)
-                        
-        return questions
+        return self._analysis['questions']
         
     def extract_candidate_responses(self) -> List[str]:
         """Extract candidate responses"""
-        responses = []
-        lines = self.transcript.split('\n')
-        
-        for line in lines:
-            # Look for lines from the candidate
-            if 'candidate' in line.lower() or 'user' in line.lower():
-                parts = line.split(':', 1)
-                if len(parts) > 1:
-                    response = parts[1].strip()
-                    if response:  # Skip empty responses
-                        responses.append(response)
-                        
-        return responses
+        return self._analysis['responses']
         
     def calculate_talk_time_ratio(self) -> Dict[str, float]:
         """
@@ -250,19 +445,9 @@ class TranscriptAnalyzer:
         Returns:
             Dictionary with word counts and ratios
         """
-        lines = self.transcript.split('\n')
-        
-        interviewer_words = 0
-        candidate_words = 0
-        
-        for line in lines:
-            word_count = len(line.split())
-            
-            if 'agent' in line.lower() or 'interviewer' in line.lower():
-                interviewer_words += word_count
-            elif 'candidate' in line.lower() or 'user' in line.lower():
-                candidate_words += word_count
-                
+        analysis = self._analysis
+        interviewer_words = analysis['interviewer_words']
+        candidate_words = analysis['candidate_words']
         total_words = interviewer_words + candidate_words
         
         if total_words == 0:
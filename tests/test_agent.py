@@ -0,0 +1,184 @@
+"""
+Tests for the InterviewAgent transcript queue and background flusher
+"""
+
+import asyncio
+import os
+import sys
+
+import orjson
+import pytest
+
+# Add src to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+# agent imports LiveKit and the Gemini plugin at module level
+pytest.importorskip("livekit.agents")
+pytest.importorskip("livekit.plugins.google")
+
+# agent validates its settings at import
+for _var in ("GOOGLE_API_KEY", "LIVEKIT_URL", "LIVEKIT_API_KEY", "LIVEKIT_API_SECRET"):
+    os.environ.setdefault(_var, "test")
+
+import agent
+from agent import InterviewAgent
+from transcription_handler import TranscriptionHandler
+
+
+@pytest.fixture
+def interview(tmp_path, monkeypatch):
+    # The transcription handler writes under ./transcripts
+    monkeypatch.chdir(tmp_path)
+    interview = InterviewAgent(candidate_id="candidate_123")
+    interview.transcription = TranscriptionHandler("candidate_123")
+    interview._transcript_fp = open(tmp_path / "transcript.txt", "w", buffering=1)
+    yield interview
+    interview._transcript_fp.close()
+
+
+def _jsonl_entries(interview):
+    if not os.path.exists(interview.transcription.transcript_file):
+        return []
+    with open(interview.transcription.transcript_file, 'rb') as f:
+        return [orjson.loads(line) for line in f]
+
+
+@pytest.mark.asyncio
+async def test_flusher_writes_full_batch_without_waiting(interview, monkeypatch):
+    monkeypatch.setattr(agent, "FLUSH_BATCH_SIZE", 3)
+    monkeypatch.setattr(agent, "FLUSH_INTERVAL", 60)
+    interview._flusher = asyncio.create_task(interview._drain_transcripts())
+
+    for i in range(4):
+        interview._queue_transcript(agent.CANDIDATE_SPEAKER, f"line {i}")
+    await asyncio.sleep(0.05)
+    assert [entry['text'] for entry in _jsonl_entries(interview)] == ["line 0", "line 1", "line 2"]
+
+    # The shutdown sentinel flushes the partial batch
+    await interview._finalize_transcript()
+    assert [entry['text'] for entry in _jsonl_entries(interview)] == [
+        "line 0", "line 1", "line 2", "line 3"
+    ]
+    assert interview._flusher.done()
+
+    with open(interview._transcript_fp.name) as f:
+        assert f.read().count("Candidate: line") == 4
+
+
+@pytest.mark.asyncio
+async def test_flusher_writes_partial_batch_after_interval(interview, monkeypatch):
+    monkeypatch.setattr(agent, "FLUSH_INTERVAL", 0.01)
+    interview._flusher = asyncio.create_task(interview._drain_transcripts())
+
+    interview._queue_transcript(agent.AI_SPEAKER, "Hello")
+    await asyncio.sleep(0.1)
+
+    assert [entry['speaker'] for entry in _jsonl_entries(interview)] == [agent.AI_SPEAKER]
+    await interview._finalize_transcript()
+
+
+@pytest.mark.asyncio
+async def test_cancelled_flusher_drains_queue(interview, monkeypatch):
+    monkeypatch.setattr(agent, "FLUSH_INTERVAL", 60)
+    interview._flusher = asyncio.create_task(interview._drain_transcripts())
+    await asyncio.sleep(0)
+
+    interview._queue_transcript(agent.CANDIDATE_SPEAKER, "first")
+    interview._queue_transcript(agent.CANDIDATE_SPEAKER, "second")
+    interview._flusher.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await interview._flusher
+
+    assert [entry['text'] for entry in _jsonl_entries(interview)] == ["first", "second"]
+
+
+@pytest.mark.asyncio
+async def test_cancel_during_write_does_not_duplicate_lines(interview, monkeypatch):
+    monkeypatch.setattr(agent, "FLUSH_BATCH_SIZE", 2)
+    monkeypatch.setattr(agent, "FLUSH_INTERVAL", 60)
+    write_started = asyncio.Event()
+    flush_batch = interview._flush_transcript_batch
+
+    async def slow_flush(batch):
+        await flush_batch(batch)
+        if batch and not write_started.is_set():
+            # Cancelled after the JSONL append, before the write returns
+            write_started.set()
+            await asyncio.sleep(10)
+
+    monkeypatch.setattr(interview, "_flush_transcript_batch", slow_flush)
+    interview._flusher = asyncio.create_task(interview._drain_transcripts())
+
+    for text in ("a", "b", "c"):
+        interview._queue_transcript(agent.CANDIDATE_SPEAKER, text)
+    await write_started.wait()
+    interview._flusher.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await interview._flusher
+
+    assert [entry['text'] for entry in _jsonl_entries(interview)] == ["a", "b", "c"]
+
+
+@pytest.mark.asyncio
+async def test_cancelled_flusher_drain_is_bounded(interview, monkeypatch):
+    monkeypatch.setattr(agent, "FLUSH_INTERVAL", 60)
+    monkeypatch.setattr(agent, "CLEANUP_STEP_TIMEOUT", 0.05)
+
+    async def hung_flush(batch):
+        await asyncio.sleep(10)
+
+    monkeypatch.setattr(interview, "_flush_transcript_batch", hung_flush)
+    interview._flusher = asyncio.create_task(interview._drain_transcripts())
+    await asyncio.sleep(0)
+
+    interview._queue_transcript(agent.CANDIDATE_SPEAKER, "stuck")
+    interview._flusher.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await asyncio.wait_for(interview._flusher, timeout=1)
+
+
+@pytest.mark.asyncio
+async def test_full_queue_drops_oldest(interview):
+    interview._transcript_q = asyncio.Queue(maxsize=2)
+
+    for text in ("a", "b", "c"):
+        interview._queue_transcript(agent.CANDIDATE_SPEAKER, text)
+
+    assert interview._transcript_drops == 1
+    assert [interview._transcript_q.get_nowait()[1] for _ in range(2)] == ["b", "c"]
+
+
+class _Participant:
+    def __init__(self, identity):
+        self.identity = identity
+
+
+class _Room:
+    def __init__(self, *identities):
+        self.remote_participants = {i: _Participant(i) for i in identities}
+
+
+@pytest.mark.asyncio
+async def test_candidate_leaving_ends_interview_with_observer_present(interview, monkeypatch):
+    monkeypatch.setattr(agent, "CANDIDATE_REJOIN_GRACE", 0.01)
+    interview._candidate_identity = "web-user-42"
+
+    # An observer leaving doesn't end the interview
+    interview._on_participant_left(_Room("web-user-42"), _Participant("observer"))
+    assert interview._rejoin_timer is None
+
+    interview._on_participant_left(_Room("observer"), _Participant("web-user-42"))
+    await asyncio.wait_for(interview._end_event.wait(), timeout=1)
+
+
+@pytest.mark.asyncio
+async def test_candidate_rejoining_cancels_end(interview):
+    interview._candidate_identity = "web-user-42"
+
+    interview._on_participant_left(_Room("observer"), _Participant("web-user-42"))
+    interview._on_participant_joined(_Participant("observer-2"))
+    assert interview._rejoin_timer is not None
+
+    interview._on_participant_joined(_Participant("web-user-42"))
+    assert interview._rejoin_timer is None
+    assert not interview._end_event.is_set()
@@ -0,0 +1,78 @@
+"""
+Tests for RecordingMetadata
+"""
+
+import os
+import sys
+
+import orjson
+import pytest
+
+# Add src to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+# recording_manager imports the LiveKit server API at module level
+pytest.importorskip("livekit.api")
+
+from recording_manager import RecordingMetadata
+
+
+def _save(metadata, candidate_id, room_name):
+    metadata.save_metadata(
+        candidate_id=candidate_id,
+        room_name=room_name,
+        egress_id=f"EG_{room_name}",
+        job_role="software_engineer",
+        duration=60.0,
+        file_path=f"recordings/{room_name}.mp4",
+    )
+
+
+def test_legacy_metadata_json_is_migrated(tmp_path):
+    legacy = [
+        {"candidate_id": "candidate_123", "room_name": "room-a"},
+        {"candidate_id": "candidate_456", "room_name": "room-b"},
+    ]
+    (tmp_path / "metadata.json").write_bytes(orjson.dumps(legacy))
+
+    metadata = RecordingMetadata(str(tmp_path))
+    _save(metadata, "candidate_123", "room-c")
+
+    rooms = [rec['room_name'] for rec in metadata.get_candidate_recordings("candidate_123")]
+    assert rooms == ["room-a", "room-c"]
+    assert not (tmp_path / "metadata.json").exists()
+    assert (tmp_path / "metadata.json.migrated").exists()
+
+    # A fresh instance reads the converted file without migrating again
+    rooms = [rec['room_name'] for rec in RecordingMetadata(str(tmp_path)).get_candidate_recordings("candidate_123")]
+    assert rooms == ["room-a", "room-c"]
+
+
+def test_index_picks_up_appends_between_lookups(tmp_path):
+    metadata = RecordingMetadata(str(tmp_path))
+    assert metadata.get_candidate_recordings("candidate_123") == []
+
+    _save(metadata, "candidate_123", "room-a")
+    _save(metadata, "candidate_456", "room-b")
+    assert [rec['room_name'] for rec in metadata.get_candidate_recordings("candidate_123")] == ["room-a"]
+
+    # Lines appended after the first lookup (here by another instance) are
+    # indexed on the next one
+    _save(RecordingMetadata(str(tmp_path)), "candidate_123", "room-c")
+    rooms = [rec['room_name'] for rec in metadata.get_candidate_recordings("candidate_123")]
+    assert rooms == ["room-a", "room-c"]
+    assert [rec['room_name'] for rec in metadata.get_candidate_recordings("candidate_456")] == ["room-b"]
+    assert metadata.get_candidate_recordings("candidate_789") == []
+
+
+def test_index_rebuilds_after_file_is_replaced(tmp_path):
+    metadata = RecordingMetadata(str(tmp_path))
+    _save(metadata, "candidate_123", "room-a")
+    _save(metadata, "candidate_123", "room-b")
+    assert len(metadata.get_candidate_recordings("candidate_123")) == 2
+
+    os.remove(metadata.metadata_file)
+    _save(metadata, "candidate_456", "room-c")
+
+    assert metadata.get_candidate_recordings("candidate_123") == []
+    assert [rec['room_name'] for rec in metadata.get_candidate_recordings("candidate_456")] == ["room-c"]
@@ -0,0 +1,212 @@
+"""
+Tests for TranscriptionHandler and TranscriptAnalyzer
+"""
+
+import asyncio
+import os
+import sys
+
+import orjson
+import pytest
+
+# Add src to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+import transcription_handler
+from transcription_handler import TranscriptAnalyzer, TranscriptionHandler
+
+
+@pytest.fixture
+def handler(tmp_path, monkeypatch):
+    # The handler writes under ./transcripts
+    monkeypatch.chdir(tmp_path)
+    return TranscriptionHandler("test_interview")
+
+
+def test_statistics_count_final_entries(handler):
+    handler.add_entry("AI_Interviewer", "Tell me about yourself?")
+    handler.add_entry("Candidate", "um", is_final=False)
+    handler.add_entry("Candidate", "I build backend services")
+
+    stats = handler.get_transcript_statistics()
+
+    assert stats == {
+        'total_entries': 3,
+        'final_entries': 2,
+        'speaker_counts': {'AI_Interviewer': 1, 'Candidate': 1},
+        'total_words': 8,
+        'speaker_words': {'AI_Interviewer': 4, 'Candidate': 4},
+    }
+
+
+def test_statistics_include_loaded_entries(handler):
+    handler.add_entry("AI_Interviewer", "Hello")
+    handler.add_entries([
+        {"timestamp": "2025-02-02T14:30:20", "speaker": "Candidate", "text": "Hi there", "is_final": True},
+        {"timestamp": "2025-02-02T14:30:21", "speaker": "Candidate", "text": "and", "is_final": False},
+    ])
+
+    stats = handler.get_transcript_statistics()
+
+    assert stats['total_entries'] == 3
+    assert stats['final_entries'] == 2
+    assert stats['speaker_words'] == {'AI_Interviewer': 1, 'Candidate': 2}
+
+
+def test_transcript_is_read_only(handler):
+    handler.add_entry("Candidate", "Hi")
+
+    with pytest.raises(AttributeError):
+        handler.transcript.append({"speaker": "Candidate", "text": "lost"})
+    with pytest.raises(AttributeError):
+        handler.transcript = []
+
+    assert len(handler.transcript) == 1
+
+    # The view tracks later additions without copying
+    view = handler.transcript
+    handler.add_entry("Candidate", "Hello again")
+    assert [entry['text'] for entry in view] == ["Hi", "Hello again"]
+    assert view[-1]['text'] == "Hello again"
+
+
+def test_full_transcript_skips_non_final(handler):
+    handler.add_entries([
+        {"timestamp": "2025-02-02T14:30:20", "speaker": "AI_Interviewer", "text": "Hello", "is_final": True},
+        {"timestamp": "2025-02-02T14:30:21", "speaker": "Candidate", "text": "Hi", "is_final": False},
+        {"timestamp": "2025-02-02T14:30:22", "speaker": "Candidate", "text": "Hi there", "is_final": True},
+    ])
+
+    assert handler.get_full_transcript() == (
+        "[14:30:20] AI_Interviewer: Hello\n"
+        "[14:30:22] Candidate: Hi there"
+    )
+    assert "Candidate: Hi\n" in handler.get_full_transcript(include_non_final=True)
+
+
+def test_export_round_trip(handler, tmp_path):
+    handler.add_entry("AI_Interviewer", "Hello")
+    handler.add_entry("Candidate", "Hi", is_final=False)
+
+    exported = orjson.loads((tmp_path / handler.export_to_json()).read_bytes())
+    reloaded = TranscriptionHandler("reloaded")
+    reloaded.add_entries(exported['transcript'])
+
+    assert reloaded.get_full_transcript() == handler.get_full_transcript()
+    assert reloaded.get_transcript_statistics() == handler.get_transcript_statistics()
+
+
+class _Participant:
+    identity = "Candidate"
+
+
+class _Event:
+    participant = _Participant()
+    is_final = True
+
+    def __init__(self, text):
+        self.text = text
+
+
+def _lines_on_disk(handler):
+    if not os.path.exists(handler.transcript_file):
+        return 0
+    with open(handler.transcript_file, 'rb') as f:
+        return sum(1 for _ in f)
+
+
+@pytest.mark.asyncio
+async def test_on_transcript_flushes_after_interval(handler, monkeypatch):
+    monkeypatch.setattr(transcription_handler, "FLUSH_INTERVAL", 0.01)
+
+    await handler.on_transcript(_Event("Hello"))
+    assert _lines_on_disk(handler) == 0
+
+    await asyncio.sleep(0.1)
+    assert _lines_on_disk(handler) == 1
+
+
+@pytest.mark.asyncio
+async def test_on_transcript_flushes_full_batch(handler, monkeypatch):
+    monkeypatch.setattr(transcription_handler, "FLUSH_BATCH_SIZE", 3)
+    monkeypatch.setattr(transcription_handler, "FLUSH_INTERVAL", 60)
+
+    for i in range(4):
+        await handler.on_transcript(_Event(f"line {i}"))
+    assert _lines_on_disk(handler) == 3
+
+    # flush() writes the remainder and stops the pending timer
+    await handler.flush()
+    assert _lines_on_disk(handler) == 4
+    assert handler._flush_timer is None
+
+
+def test_talk_time_ratio_matches_for_text_and_entries(handler):
+    handler.add_entry("AI_Interviewer", "Tell me about yourself?")
+    handler.add_entry("Candidate", "I build backend services in Python")
+
+    from_text = TranscriptAnalyzer(handler.get_full_transcript())
+    from_entries = TranscriptAnalyzer.from_entries(handler.transcript)
+
+    assert from_text.calculate_talk_time_ratio() == from_entries.calculate_talk_time_ratio()
+    assert from_text.calculate_talk_time_ratio()['interviewer_words'] == 4
+    assert from_text.calculate_talk_time_ratio()['candidate_words'] == 6
+
+
+def test_analyzer_parses_timestamped_lines():
+    analyzer = TranscriptAnalyzer(
+        "[14:30:20] AI_Interviewer: Tell me about yourself?\n"
+        "[14:30:25] Candidate: I build backend services\n"
+        "[14:30:30] AI_Interviewer: Great.\n"
+        "[14:30:31] Candidate:\n"
+        "Some line without a speaker"
+    )
+
+    assert analyzer.extract_questions() == ["Tell me about yourself?"]
+    assert analyzer.extract_candidate_responses() == ["I build backend services"]
+    assert analyzer.calculate_talk_time_ratio() == {
+        'interviewer_words': 5,
+        'candidate_words': 4,
+        'interviewer_ratio': 5 / 9,
+        'candidate_ratio': 4 / 9,
+    }
+
+
+def test_analyzer_prefers_interviewer_role():
+    analyzer = TranscriptAnalyzer.from_entries([
+        {"speaker": "user_agent", "text": "Any questions for me?", "is_final": True},
+        {"speaker": "Candidate", "text": "No", "is_final": True},
+        {"speaker": "Observer", "text": "ignored words here", "is_final": True},
+    ])
+
+    assert analyzer.extract_questions() == ["Any questions for me?"]
+    assert analyzer.extract_candidate_responses() == ["No"]
+    assert analyzer.calculate_talk_time_ratio()['interviewer_words'] == 4
+    assert analyzer.calculate_talk_time_ratio()['candidate_words'] == 1
+
+
+@pytest.mark.asyncio
+async def test_timer_and_batch_flushes_write_in_order(handler, monkeypatch):
+    monkeypatch.setattr(transcription_handler, "FLUSH_BATCH_SIZE", 2)
+    monkeypatch.setattr(transcription_handler, "FLUSH_INTERVAL", 0.01)
+    write_started = asyncio.Event()
+    append_lines = handler._append_lines
+
+    async def slow_save(entries):
+        if not write_started.is_set():
+            # The timer's write is still in progress when the batch flushes
+            write_started.set()
+            await asyncio.sleep(0.05)
+        append_lines(b''.join(orjson.dumps(entry) + b'\n' for entry in entries))
+
+    monkeypatch.setattr(handler, "save_transcript_chunks", slow_save)
+
+    await handler.on_transcript(_Event("first"))
+    await write_started.wait()
+    await handler.on_transcript(_Event("second"))
+    await handler.on_transcript(_Event("third"))
+    await handler.flush()
+
+    with open(handler.transcript_file, 'rb') as f:
+        assert [orjson.loads(line)['text'] for line in f] == ["first", "second", "third"]
+    assert handler._flush_timer is None